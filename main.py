@@ -1,12 +1,18 @@
 import streamlit as st
 import pandas as pd
 from utils import (
+    MAX_DAYS_LIMIT,
     load_and_validate_csv,
     process_stock_data,
     create_return_distribution_chart,
     create_success_rate_chart
 )
 
+FOOTER = """
+---
+Created with ❤️ using Streamlit | Data source: Yahoo Finance (NSE)
+"""
+
 # Page configuration
 st.set_page_config(
     page_title="NSE Stock Analysis Tool",
@@ -28,7 +34,7 @@ with col1:
 with col2:
     min_days = st.number_input("Minimum Days", min_value=1, max_value=10, value=5)
 with col3:
-    max_days = st.number_input("Maximum Days", min_value=min_days, max_value=15, value=6)
+    max_days = st.number_input("Maximum Days", min_value=min_days, max_value=MAX_DAYS_LIMIT, value=6)
 
 # File upload
 uploaded_file = st.file_uploader(
@@ -66,59 +72,43 @@ if uploaded_file is not None:
 
             # Display statistics
             st.subheader("📊 Summary Statistics")
+            target_met = processed_df['target_met'].to_numpy(dtype=bool)
+            hits = processed_df.loc[target_met, ['return_pct', 'days_taken']]
+            avg_return = hits['return_pct'].mean()
+            avg_days = hits['days_taken'].mean()
+            success_rate = target_met.sum() / target_met.size * 100
+
             stats_col1, stats_col2, stats_col3 = st.columns(3)
 
             with stats_col1:
-                avg_return = processed_df[processed_df['target_met']]['return_pct'].mean()
                 st.metric(
                     f"Average Return (When Hit {target_return}%)", 
                     f"{avg_return:.2f}%" if pd.notna(avg_return) else "N/A"
                 )
 
             with stats_col2:
-                success_rate = (
-                    processed_df['target_met'].sum() /
-                    len(processed_df['target_met'].dropna()) * 100
-                )
                 st.metric(f"Success Rate (Hit {target_return}%)", f"{success_rate:.2f}%")
 
             with stats_col3:
-                avg_days = processed_df[processed_df['target_met']]['days_taken'].mean()
                 st.metric("Avg Days to Hit Target", f"{avg_days:.1f}" if pd.notna(avg_days) else "N/A")
 
             # Display data table
             st.subheader("📋 Detailed Results")
 
-            # Format the dataframe
-            display_df = processed_df[['symbol', 'date', 'entry_price', 'target_price', 'return_pct', 'days_taken', 'target_met']].copy()
-            # Fill NA values before formatting
-            display_df['return_pct'] = display_df['return_pct'].fillna('N/A')
-            display_df['days_taken'] = display_df['days_taken'].fillna('N/A')
-            display_df['entry_price'] = display_df['entry_price'].fillna('N/A')
-            display_df['target_price'] = display_df['target_price'].fillna('N/A')
-
-            # Format numeric values
-            display_df.loc[display_df['return_pct'] != 'N/A', 'return_pct'] = \
-                display_df.loc[display_df['return_pct'] != 'N/A', 'return_pct'].map('{:.2f}%'.format)
-            display_df.loc[display_df['entry_price'] != 'N/A', 'entry_price'] = \
-                display_df.loc[display_df['entry_price'] != 'N/A', 'entry_price'].map('{:.2f}'.format)
-            display_df.loc[display_df['target_price'] != 'N/A', 'target_price'] = \
-                display_df.loc[display_df['target_price'] != 'N/A', 'target_price'].map('{:.2f}'.format)
-
+            # Keep values numeric and let the frontend format them and fill in missing ones
             st.dataframe(
-                display_df,
-                use_container_width=True
+                processed_df,
+                column_order=['symbol', 'date', 'entry_price', 'target_price', 'return_pct', 'days_taken', 'target_met'],
+                column_config={
+                    'return_pct': st.column_config.NumberColumn(format='%.2f%%'),
+                    'entry_price': st.column_config.NumberColumn(format='%.2f'),
+                    'target_price': st.column_config.NumberColumn(format='%.2f'),
+                    'days_taken': st.column_config.NumberColumn(format='%d'),
+                },
+                placeholder='N/A',
+                use_container_width=True,
+                hide_index=True
             )
 
-            # Add footer
-            st.markdown("""
-            ---
-            Created with ❤️ using Streamlit | Data source: Yahoo Finance (NSE)
-            """)
-
-# Add footer when no file is uploaded
-if uploaded_file is None:
-    st.markdown("""
-    ---
-    Created with ❤️ using Streamlit | Data source: Yahoo Finance (NSE)
-    """)
\ No newline at end of file
+# Add footer
+st.markdown(FOOTER)
@@ -1,55 +1,164 @@
+from functools import lru_cache
+
+import numpy as np
 import pandas as pd
+import streamlit as st
 import yfinance as yf
-import plotly.express as px
 import plotly.graph_objects as go
+from numba import njit, prange
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Upper bound of the Maximum Days input; downloads always cover it so the cache key ignores max_days
+MAX_DAYS_LIMIT = 15
+
+# Tickers per yf.download call; yfinance fetches each batch on its own thread pool
+DOWNLOAD_BATCH_SIZE = 100
 
 def load_and_validate_csv(uploaded_file):
     """Load and validate the CSV file"""
     try:
-        df = pd.read_csv(uploaded_file, usecols=['symbol', 'date'])
-        df['date'] = pd.to_datetime(df['date'], format='%d-%m-%Y', dayfirst=True)
+        # Pin both columns to text so Arrow's type inference can't bypass the date format check
+        df = pd.read_csv(uploaded_file, usecols=['symbol', 'date'], engine='pyarrow', dtype_backend='pyarrow',
+                         dtype={'symbol': 'string[pyarrow]', 'date': 'string[pyarrow]'})
+        # Scan inputs repeat dates heavily, so parse each distinct string once
+        df['date'] = pd.to_datetime(df['date'], format='%d-%m-%Y', cache=True)
+        # Symbols repeat across rows; integer codes make grouping them cheap
+        df['symbol'] = df['symbol'].astype('category')
         return df, None
     except Exception as e:
         return None, f"Error loading CSV: {str(e)}"
 
-def fetch_stock_data(symbols, start_dates, max_days):
-    """Fetch historical data for multiple stocks in a single request"""
-    start_date = min(start_dates)
-    end_date = start_date + pd.Timedelta(days=max_days)
-    
+@lru_cache(maxsize=None)
+def make_scanner(max_days, target_return):
+    """Compile a first-hit scan with the window length and target multiplier baked in"""
+    # The window spans max_days calendar days inclusive, so at most max_days + 1 bars
+    window = max_days + 1
+    multiplier = np.float32(1 + target_return / 100)
+
+    # Only FMA contraction is enabled; full fastmath would assume no NaNs in the price data
+    @njit(cache=True, parallel=True, nogil=True, fastmath={'contract'})
+    def scan_first_hit(highs2d, entry, out_day, out_ret):
+        """Record the first bar in each window whose high reaches the target"""
+        for i in prange(highs2d.shape[0]):
+            target = entry[i] * multiplier
+            for j in range(window):
+                if highs2d[i, j] >= target:
+                    out_day[i] = j
+                    out_ret[i] = (highs2d[i, j] - entry[i]) / entry[i] * 100
+                    break
+
+    return scan_first_hit
+
+def _hash_frame(df):
+    """Hash every row, since Streamlit only samples large frames"""
+    return pd.util.hash_pandas_object(df, index=True).sum()
+
+class _IncompleteDownload(Exception):
+    """Carries a batch with failed tickers out of the cache so it is fetched again next run"""
+
+    def __init__(self, data):
+        super().__init__("some tickers failed to download")
+        self.data = data
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _download_batch(tickers, start, end):
+    """Download one batch of tickers, keeping only the price fields the scan uses"""
+    data = yf.download(list(tickers), start=start, end=end, group_by='ticker', progress=False,
+                       threads=True, actions=False, auto_adjust=True)
+    if not isinstance(data.columns, pd.MultiIndex):
+        # Nothing usable came back; keep the (ticker, field) column shape for the merge
+        raise _IncompleteDownload(pd.DataFrame(index=data.index, columns=pd.MultiIndex.from_arrays([[], []])))
+    data = data.loc[:, (slice(None), ['High', 'Close'])]
+
+    # yfinance fills failed tickers with NaN instead of raising; don't cache those for an hour
+    has_prices = data.notna().any()
+    if not set(tickers) <= set(has_prices[has_prices].index.get_level_values(0)):
+        raise _IncompleteDownload(data)
+    return data
+
+def fetch_stock_data(symbols, start, end):
+    """Fetch historical data for multiple stocks in batched requests"""
     tickers = [f"{sym}.NS" for sym in symbols]
-    data = yf.download(tickers, start=start_date, end=end_date, group_by='ticker', progress=False)
-    
+    batches = []
+    for i in range(0, len(tickers), DOWNLOAD_BATCH_SIZE):
+        try:
+            batches.append(_download_batch(tuple(tickers[i:i + DOWNLOAD_BATCH_SIZE]), start, end))
+        except _IncompleteDownload as e:
+            batches.append(e.data)
+    # Align every ticker on one date index, sorted for the searchsorted lookups in the scan
+    data = pd.concat(batches, axis=1, sort=True).sort_index() if batches else pd.DataFrame()
+
     return data
 
+def _price_arrays(stock_data, field):
+    """Map each ticker to a float32 array of one price field"""
+    if not isinstance(stock_data.columns, pd.MultiIndex) or field not in stock_data.columns.levels[1]:
+        return {}
+    prices = stock_data.xs(field, axis=1, level=1)
+    return dict(zip(prices.columns, prices.to_numpy(dtype=np.float32).T))
+
 def process_stock_data(df, target_return, min_days, max_days):
     """Process stock data efficiently"""
-    unique_symbols = df['symbol'].unique()
-    stock_data = fetch_stock_data(unique_symbols, df['date'], max_days)
-    
-    results = []
-    for symbol, start_date in zip(df['symbol'], df['date']):
-        try:
-            data = stock_data[f"{symbol}.NS"]
-            start_price = data.loc[start_date, 'Close']
-            high_prices = data.loc[start_date:start_date + pd.Timedelta(days=max_days), 'High']
-            
-            # Identify the first day hitting target return
-            target_price = start_price * (1 + target_return / 100)
-            hit_day = (high_prices >= target_price).idxmax()
-            
-            if high_prices.loc[hit_day] >= target_price:
-                days_taken = (hit_day - start_date).days
-                return_pct = (high_prices.loc[hit_day] - start_price) / start_price * 100
-            else:
-                return_pct, days_taken, target_price = None, None, None
-
-        except Exception:
-            return_pct, days_taken, start_price, target_price = None, None, None, None
-
-        results.append([return_pct, days_taken, start_price, target_price])
-
-    df[['return_pct', 'days_taken', 'entry_price', 'target_price']] = results
+    unique_symbols = df['symbol'].cat.categories.to_numpy()
+    # Cover every request's window; the buffer absorbs weekends and yfinance's exclusive end
+    start = pd.Timestamp(df['date'].min())
+    end = pd.Timestamp(df['date'].max()) + pd.Timedelta(days=MAX_DAYS_LIMIT + 5)
+    stock_data = fetch_stock_data(tuple(sorted(unique_symbols)), start, end)
+
+    return analyze_stock_data(df, stock_data, target_return, max_days)
+
+@st.cache_data(ttl=3600, max_entries=64, show_spinner=False, hash_funcs={pd.DataFrame: _hash_frame})
+def analyze_stock_data(df, stock_data, target_return, max_days):
+    """Find when each requested stock first hits the target return"""
+    df = df.copy()
+    # Work in int64 day numbers so date arithmetic is plain integer subtraction
+    dates = stock_data.index.values.astype('datetime64[D]').view('i8')
+    request_dates = df['date'].values.astype('datetime64[D]').view('i8')
+    # float32 is ample for price comparisons and halves the memory scanned
+    ticker_highs = _price_arrays(stock_data, 'High')
+    ticker_closes = _price_arrays(stock_data, 'Close')
+
+    window = max_days + 1
+
+    # fetch_stock_data aligns tickers on one sorted index; entry is the bar on the start date itself
+    pos = np.searchsorted(dates, request_dates)
+    found = pos < len(dates)
+    found[found] = dates[pos[found]] == request_dates[found]
+    stop = np.searchsorted(dates, request_dates + max_days, side='right')
+
+    # One row of highs per request; rows left as NaN never hit
+    entry_price = np.full(len(df), np.nan, dtype=np.float32)
+    windows = np.full((len(df), window), np.nan, dtype=np.float32)
+    # Group request rows by symbol code; missing symbols (code -1) sort ahead of every group
+    codes = df['symbol'].cat.codes.to_numpy()
+    order = np.argsort(codes, kind='stable')
+    tickers = df['symbol'].cat.categories + '.NS'
+    bounds = np.searchsorted(codes[order], np.arange(len(tickers) + 1))
+    for code, ticker in enumerate(tickers):
+        if ticker not in ticker_highs:
+            continue
+        rows = order[bounds[code]:bounds[code + 1]]
+        rows = rows[found[rows]]
+        entry_price[rows] = ticker_closes[ticker][pos[rows]]
+        padded = np.concatenate([ticker_highs[ticker], np.full(window, np.nan, dtype=np.float32)])
+        windows[rows] = sliding_window_view(padded, window)[pos[rows]]
+
+    # Blank out bars past each request's calendar window so the scan needs no bounds
+    windows[np.arange(window) >= (stop - pos)[:, None]] = np.nan
+
+    # Scan all symbols' requests in a single parallel kernel call
+    hit_day = np.full(len(df), -1)
+    hit_ret = np.full(len(df), np.nan)
+    make_scanner(max_days, target_return)(windows, entry_price, hit_day, hit_ret)
+    target_price = entry_price * np.float32(1 + target_return / 100)
+
+    met = hit_day >= 0
+    days_taken = np.full(len(df), np.nan)
+    days_taken[met] = dates[pos[met] + hit_day[met]] - request_dates[met]
+
+    df[['return_pct', 'days_taken', 'entry_price', 'target_price']] = np.column_stack(
+        [hit_ret, days_taken, entry_price, np.where(met, target_price, np.nan)]
+    )
     df['target_met'] = df['return_pct'].notna()
 
     return df
@@ -60,8 +169,12 @@ def create_return_distribution_chart(df, target_return):
     if successful_returns.empty:
         return go.Figure().add_annotation(text="No data available", x=0.5, y=0.5, showarrow=False)
 
-    fig = px.histogram(successful_returns, nbins=30, title=f'Distribution of Returns (Target {target_return}%)',
-                        labels={'value': 'Return (%)'}, color_discrete_sequence=['#FF4B4B'])
+    # Bin server-side so only the bar heights are sent to the browser
+    counts, edges = np.histogram(successful_returns.to_numpy(), bins=30)
+    fig = go.Figure(data=[go.Bar(x=(edges[:-1] + edges[1:]) / 2, y=counts, width=np.diff(edges),
+                                 marker_color='#FF4B4B')])
+    fig.update_layout(title=f'Distribution of Returns (Target {target_return}%)',
+                      xaxis_title='Return (%)', yaxis_title='count')
     fig.add_vline(x=target_return, line_dash="dash", line_color="green", annotation_text=f"{target_return}% Target")
     return fig
 